@@ -1,14 +1,34 @@
+from __future__ import annotations
+
+import math
+from contextlib import nullcontext
+
 import paddle
 from paddle.amp.auto_cast import amp_state
 from paddle.base.unique_name import UniqueNameGenerator
 from paddle.base.unique_name import guard as UniqueNameGuard
 from paddle.static import Program
-from paddle.utils import flatten, is_sequence
+from paddle.utils import is_sequence
 
-from .utils import Cache, Singleton, map_if_extend, meta_str
+from .utils import Cache, Singleton, map_structure_extend, meta_str
 
 
 class MetaInfo:
+    __slots__ = (
+        "name",
+        "persistable",
+        "type",
+        "place",
+        "shape",
+        "ndim",
+        "_dynamic",
+        "dtype",
+        "stop_gradient",
+        "_hash",
+        "_repr",
+        "_numel",
+    )
+
     def __init__(
         self, shape, dtype, stop_gradient, name, persistable, type, place
     ):
@@ -16,15 +36,29 @@ class MetaInfo:
         self.persistable = persistable
         self.type = type
         self.place = place
-        self.shape = shape
+        self.shape = tuple(shape)
+        self.ndim = len(self.shape)
+        self._dynamic = -1 in self.shape
         self.dtype = dtype
         self.stop_gradient = stop_gradient
+        # MetaInfo is immutable, so the hash can be computed only once.
+        self._hash = hash((self.shape, dtype, stop_gradient))
+        # The repr is lazily computed and cached, see __repr__.
+        self._repr = None
+        self._numel = None
 
     @staticmethod
     def from_tensor(tensor):
+        return MetaInfo.from_tensor_with_amp_state(tensor, amp_state())
+
+    @staticmethod
+    def from_tensor_with_amp_state(tensor, current_amp_state):
+        """
+        Same as from_tensor, but use the given amp state, so the amp state can
+        be queried only once when converting a batch of tensors.
+        """
         # We always use float32 in simulation if AMP is enabled.
         dtype = tensor.dtype
-        current_amp_state = amp_state()
         if (
             dtype == paddle.float16
             and current_amp_state is not None
@@ -32,7 +66,7 @@ class MetaInfo:
         ):
             dtype = paddle.float32
         return MetaInfo(
-            list(tensor.shape),
+            tensor.shape,
             dtype,
             tensor.stop_gradient,
             tensor.name,
@@ -46,7 +80,15 @@ class MetaInfo:
         if -1 in shape, return True
         else: return False
         """
-        return -1 in self.shape
+        return self._dynamic
+
+    def numel(self):
+        """
+        Return the number of elements, it's computed once and cached.
+        """
+        if self._numel is None:
+            self._numel = math.prod(self.shape)
+        return self._numel
 
     def to_input_spec(self):
         return paddle.static.InputSpec(
@@ -57,7 +99,9 @@ class MetaInfo:
         return f"({self.shape}, {self.dtype}, {self.stop_gradient})"
 
     def __repr__(self):
-        return meta_str(self.shape, self.dtype, self.stop_gradient)
+        if self._repr is None:
+            self._repr = meta_str(self.shape, self.dtype, self.stop_gradient)
+        return self._repr
 
     def __eq__(self, meta):
         return (
@@ -67,7 +111,7 @@ class MetaInfo:
         )
 
     def __hash__(self):
-        return hash((tuple(self.shape), self.dtype, self.stop_gradient))
+        return self._hash
 
 
 @Singleton
@@ -83,12 +127,6 @@ class VariableCreator:
         self.startup_program = Program()
         self.var_name_generator = UniqueNameGenerator("infer_meta_variable_")
 
-    def gen_name(self, meta):
-        name = f"{meta.dtype}_{meta.stop_gradient}"
-        for l in meta.shape:
-            name += f"_{l}"
-        return name
-
     def create_var(self, meta):
         var = self.main_program.global_block().create_var(
             shape=meta.shape,
@@ -101,18 +139,22 @@ class VariableCreator:
         return var
 
     def get_variable(self, meta):
-        var_feature_name = self.gen_name(meta)
-        if var_feature_name not in self.var_cache:
-            self.var_cache[var_feature_name] = self.create_var(meta)
-        return self.var_cache[var_feature_name]
+        key = (meta.dtype, meta.stop_gradient, meta.shape)
+        var = self.var_cache.get(key)
+        if var is None:
+            var = self.var_cache[key] = self.create_var(meta)
+        return var
 
     def infer_meta(self, func, *args, **kwargs):
-        with paddle.base.framework._dygraph_guard(None), UniqueNameGuard(
-            self.var_name_generator
-        ):
-            args, kwargs = convert_meta_to_variable(
-                args
-            ), convert_meta_to_variable(kwargs)
+        # Switching the global mode is not free, skip it if already static.
+        static_guard = (
+            paddle.base.framework._dygraph_guard(None)
+            if paddle.in_dynamic_mode()
+            else nullcontext()
+        )
+        with static_guard, UniqueNameGuard(self.var_name_generator):
+            args = convert_meta_to_variable(args)
+            kwargs = convert_meta_to_variable(kwargs)
 
             with paddle.static.program_guard(
                 self.main_program, self.startup_program
@@ -127,34 +169,66 @@ class VariableCreator:
         return convert_variable_to_meta_info(out)
 
 
+_SCALAR_TYPES = frozenset([int, float, bool, str, type(None)])
+
+
+def collect_structure_hashes(structure, hashes: list[int]):
+    """
+    Walk the nested structure once and append the hash of every leaf to
+    `hashes`, the memoized hash of MetaInfo is reused instead of rehashing it.
+    """
+    if isinstance(structure, MetaInfo):
+        hashes.append(structure._hash)
+    elif isinstance(structure, (list, tuple)):
+        for item in structure:
+            # Fast path for the common leaves, avoid the recursive call.
+            item_type = type(item)
+            if item_type is MetaInfo:
+                hashes.append(item._hash)
+            elif item_type in _SCALAR_TYPES:
+                hashes.append(hash(item))
+            else:
+                collect_structure_hashes(item, hashes)
+    elif isinstance(structure, dict):
+        for key, value in structure.items():
+            hashes.append(hash(key))
+            collect_structure_hashes(value, hashes)
+    else:
+        hashes.append(hash(structure))
+
+
+def _meta_to_variable(x):
+    if isinstance(x, MetaInfo):
+        return VariableCreator().get_variable(x)
+    return x
+
+
+def _meta_to_input_spec(x):
+    if isinstance(x, MetaInfo):
+        return x.to_input_spec()
+    # TODO(xiongkun): can x be tensor ?
+    if isinstance(x, paddle.Tensor):
+        return paddle.static.InputSpec.from_tensor(x)
+    return x
+
+
 def convert_meta_to_variable(args):
-    return map_if_extend(
-        args,
-        pred=lambda x: isinstance(x, MetaInfo),
-        true_fn=lambda x: VariableCreator().get_variable(x),
-        false_fn=lambda x: x,
-    )
+    return map_structure_extend(args, _meta_to_variable)
 
 
 def convert_meta_to_input_spec(args):
-    return map_if_extend(
-        args,
-        pred=lambda x: isinstance(x, MetaInfo),
-        true_fn=lambda x: x.to_input_spec(),
-        # TODO(xiongkun): can x be tensor ?
-        false_fn=lambda x: paddle.static.InputSpec.from_tensor(x)
-        if isinstance(x, paddle.Tensor)
-        else x,
-    )
+    return map_structure_extend(args, _meta_to_input_spec)
 
 
 def convert_variable_to_meta_info(args):
-    return map_if_extend(
-        args,
-        pred=lambda x: isinstance(x, paddle.static.Variable),
-        true_fn=lambda x: MetaInfo.from_tensor(x),
-        false_fn=lambda x: x,
-    )
+    current_amp_state = amp_state()
+
+    def variable_to_meta_info(x):
+        if isinstance(x, paddle.static.Variable):
+            return MetaInfo.from_tensor_with_amp_state(x, current_amp_state)
+        return x
+
+    return map_structure_extend(args, variable_to_meta_info)
 
 
 def infer_meta(func, *args, **kwargs):
@@ -227,14 +301,10 @@ class InferMetaCache(Cache):
         self, func, *args, **kwargs
     ):  # args & kwargs have transformed to MetaInfo
         try:
-            retval = hash(
-                (
-                    func,
-                    tuple(flatten(args)),
-                    tuple(kwargs.keys()),
-                    tuple(flatten(kwargs)),
-                )
-            )
+            hashes = [hash(func)]
+            collect_structure_hashes(args, hashes)
+            collect_structure_hashes(kwargs, hashes)
+            retval = hash(tuple(hashes))
         except Exception as e:
             return None
         return retval
@@ -251,15 +321,11 @@ class LayerInferMetaCache(Cache):
             for x in layer.parameters(include_sublayers=True)
         ]
         try:
-            retval = hash(
-                (
-                    layer,
-                    tuple(params),
-                    tuple(flatten(args)),
-                    tuple(kwargs.keys()),
-                    tuple(flatten(kwargs)),
-                )
-            )
+            hashes = [hash(layer)]
+            collect_structure_hashes(params, hashes)
+            collect_structure_hashes(args, hashes)
+            collect_structure_hashes(kwargs, hashes)
+            retval = hash(tuple(hashes))
         except Exception as e:
             return None
         return retval
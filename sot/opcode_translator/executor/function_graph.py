@@ -456,7 +456,7 @@ class FunctionGraph:
             convert_to_symbol(args),
             convert_to_symbol(kwargs),
         )
-        log(3, f"         inputs : {inputs_symbols}", "\n")
+        log_do(3, lambda: print(f"         inputs : {inputs_symbols}"))
 
         outputs = map_if(
             out_metas,
@@ -33,6 +33,7 @@ from ..instruction_utils import (
     analysis_used_names_with_space,
     calc_stack_effect,
     get_instructions,
+    index_by_identity,
 )
 from ..instruction_utils.opcode_info import JumpDirection, PopJumpCond
 from .dispatch_functions import (
@@ -518,8 +519,9 @@ class OpcodeExecutorBase:
             self._current_line = instr.starts_line
         if not hasattr(self, instr.opname):
             raise FallbackError(f"opcode: {instr.opname} is not supported.")
-        log_message = f"[Translate {self._name}]: (line {self._current_line:>3}) {instr.opname:<12} {instr.argval}, stack is {self.stack}\n"
-        log(3, log_message)
+        # Formatting the stack is costly, so the message is only built when
+        # it is really printed.
+        log_do(3, lambda: print(self._step_message(instr)))
         code_file = self._code.co_filename
         code_line = self._current_line
         code_name = self._code.co_name
@@ -530,12 +532,15 @@ class OpcodeExecutorBase:
             code_file, code_line, code_name, code_offset
         ):
             BreakpointManager().locate(self)
-            print(log_message)
+            print(self._step_message(instr))
             breakpoint()  # breakpoint for debug
 
         with EventGuard(f"{instr.opname}", event_level=1):
             return getattr(self, instr.opname)(instr)  # run single step.
 
+    def _step_message(self, instr: Instruction) -> str:
+        return f"[Translate {self._name}]: (line {self._current_line:>3}) {instr.opname:<12} {instr.argval}, stack is {self.stack}"
+
     def indexof(self, instr: Instruction):
         """
         Gets the index of the instruction.
@@ -1754,9 +1759,9 @@ class OpcodeExecutor(OpcodeExecutorBase):
         # relocate jump
         out_loop = for_iter.jump_to
         for instr in pycode_gen._instructions:
-            if instr.jump_to == for_iter:
+            if instr.jump_to is for_iter:
                 instr.jump_to = nop_for_continue
-            if instr.jump_to == out_loop:
+            if instr.jump_to is out_loop:
                 instr.jump_to = nop_for_break
 
         # outputs is the same as inputs
@@ -1978,14 +1983,13 @@ class OpcodeExecutor(OpcodeExecutorBase):
 
         nop_for_break = pycode_gen._add_instr("NOP")
 
+        origin_instr_idx = index_by_identity(origin_instrs)
         for instr in pycode_gen._instructions:
-            if instr.jump_to == for_iter_instr:
+            if instr.jump_to is for_iter_instr:
                 instr.jump_to = nop_for_continue
 
-            if (
-                instr.jump_to in origin_instrs
-                and origin_instrs.index(instr.jump_to) >= end_idx
-            ):
+            jump_to_idx = origin_instr_idx.get(id(instr.jump_to))
+            if jump_to_idx is not None and jump_to_idx >= end_idx:
                 instr.jump_to = nop_for_break
 
         jump.jump_to = for_iter_instr
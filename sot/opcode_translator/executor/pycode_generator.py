@@ -4,13 +4,15 @@
 
 from __future__ import annotations
 
+import dis
+import itertools
+import operator
 import random
 import sys
 import types
+from collections import deque
 from typing import TYPE_CHECKING
 
-import opcode
-
 import paddle
 
 from ...utils import (
@@ -19,22 +21,25 @@ from ...utils import (
     OrderedSet,
     ResumeFnNameFactory,
     is_clean_code,
-    list_contain_by_id,
-    list_find_index_by_id,
     no_eval_frame,
 )
 from ..instruction_utils import (
     analysis_inputs,
+    build_index,
     calc_stack_effect,
     gen_instr,
+    get_cached_instructions,
     get_instructions,
+    index_by_identity,
     instrs_info,
     modify_instrs,
     modify_vars,
 )
 from ..instruction_utils.opcode_info import (
+    CLS_ALL_JUMP,
+    CLS_UNCONDITIONAL_JUMP,
+    OPCODE_CLASS,
     PYOPCODE_CACHE_SIZE,
-    UNCONDITIONAL_JUMP,
     JumpDirection,
     PopJumpCond,
 )
@@ -90,6 +95,17 @@ def get_pycode_attributes() -> list[str]:
 
 
 PYCODE_ATTRIBUTES = get_pycode_attributes()
+# Fetch all attributes of PyCodeObject in one call.
+_get_pycode_attributes_values = operator.attrgetter(*PYCODE_ATTRIBUTES)
+# The attributes of PyCodeObject that are tuples, they are stored as lists in
+# code options so that they can be modified.
+PYCODE_TUPLE_ATTRIBUTES = [
+    "co_consts",
+    "co_names",
+    "co_varnames",
+    "co_freevars",
+    "co_cellvars",
+]
 
 
 def gen_code_options(code: types.CodeType) -> dict[str, Any]:
@@ -102,12 +118,11 @@ def gen_code_options(code: types.CodeType) -> dict[str, Any]:
     Returns:
         dict[str, any]: The code options.
     """
-    code_options = {}
-    for k in PYCODE_ATTRIBUTES:
-        val = getattr(code, k)
-        if isinstance(val, tuple):
-            val = list(val)
-        code_options[k] = val
+    code_options = dict(
+        zip(PYCODE_ATTRIBUTES, _get_pycode_attributes_values(code))
+    )
+    for k in PYCODE_TUPLE_ATTRIBUTES:
+        code_options[k] = list(code_options[k])
 
     return code_options
 
@@ -139,9 +154,8 @@ def gen_new_opcode(
     if sys.version_info >= (3, 11):
         # TODO: generate 3.11 exception table
         code_options["co_exceptiontable"] = bytes([])
-    for key, val in code_options.items():
-        if isinstance(val, list):
-            code_options[key] = tuple(val)
+    for key in PYCODE_TUPLE_ATTRIBUTES:
+        code_options[key] = tuple(code_options[key])
     # code_options is a dict, use keys to makesure the input order
     return types.CodeType(*[code_options[k] for k in keys])
 
@@ -159,8 +173,8 @@ def assemble(
     Returns:
         tuple[bytes, bytes]: The assembled bytecode and lnotab.
     """
-    code = []
-    linetable = []
+    code = bytearray()
+    linetable = bytearray()
 
     calc_linetable, update_cursor = create_linetable_calculator(firstlineno)
 
@@ -172,10 +186,10 @@ def assemble(
 
         # get bytecode
         arg = instr.arg or 0
-        code.extend((instr.opcode, arg & 0xFF))
+        code.append(instr.opcode)
+        code.append(arg & 0xFF)
         # fill CACHE
-        for _ in range(get_instruction_size(instr) // 2 - 1):
-            code.extend((0, 0))
+        code.extend(bytes(get_instruction_size(instr) - 2))
 
     if sys.version_info >= (3, 11):
         # End hook for Python 3.11
@@ -202,6 +216,60 @@ def to_byte(num):
     return num
 
 
+def split_offset(offset: int, min_step: int, max_step: int) -> list[int]:
+    """
+    Splits the offset into steps in range [min_step, max_step], all the steps
+    are the boundary value except the last one.
+
+    Args:
+        offset (int): The offset to split.
+        min_step (int): The minimum value of a step, should not be positive.
+        max_step (int): The maximum value of a step, should be positive.
+
+    Returns:
+        list[int]: The steps, their sum is the offset.
+    """
+    if offset > 0:
+        n_full_steps, rest = divmod(offset, max_step)
+        return [max_step] * n_full_steps + ([rest] if rest else [])
+    if offset < 0:
+        n_full_steps, rest = divmod(offset, min_step)
+        return [min_step] * n_full_steps + ([rest] if rest else [])
+    return []
+
+
+def encode_lnotab_entries(
+    byte_offset: int,
+    line_offset: int,
+    max_byte_step: int,
+    min_line_step: int,
+    max_line_step: int,
+) -> bytearray:
+    """
+    Encodes the (byte_offset, line_offset) pair into lnotab entries, which is
+    used by the lnotab of Python 3.8/3.9 and the linetable of Python 3.10.
+
+    Args:
+        byte_offset (int): The offset of bytecode, should not be negative.
+        line_offset (int): The offset of line number.
+        max_byte_step (int): The maximum byte offset of an entry.
+        min_line_step (int): The minimum line offset of an entry.
+        max_line_step (int): The maximum line offset of an entry.
+
+    Returns:
+        bytearray: The encoded entries.
+    """
+    byte_steps = split_offset(byte_offset, 0, max_byte_step)
+    line_steps = split_offset(line_offset, min_line_step, max_line_step)
+    result = bytearray()
+    for byte_step, line_step in itertools.zip_longest(
+        byte_steps, line_steps, fillvalue=0
+    ):
+        result.append(byte_step)
+        result.append(to_byte(line_step))
+    return result
+
+
 def get_instruction_size(instr: Instruction) -> int:
     cache_size = 0
     if sys.version_info >= (3, 11):
@@ -244,15 +312,7 @@ def create_linetable_calculator(firstlineno: int):
         nonlocal cur_lineno, cur_bytecode
         line_offset = starts_line - cur_lineno
         byte_offset = code_length - cur_bytecode
-        result = []
-
-        while line_offset or byte_offset:
-            line_offset_step = min(max(line_offset, -128), 127)
-            byte_offset_step = min(max(byte_offset, 0), 255)
-            result.extend((byte_offset_step, to_byte(line_offset_step)))
-            line_offset -= line_offset_step
-            byte_offset -= byte_offset_step
-        return result
+        return encode_lnotab_entries(byte_offset, line_offset, 255, -128, 127)
 
     def calc_linetable_py310(starts_line: int, code_length: int):
         """
@@ -268,44 +328,41 @@ def create_linetable_calculator(firstlineno: int):
         """
         nonlocal cur_lineno, cur_bytecode, line_offset
         byte_offset = code_length - cur_bytecode
-        result = []
-        while line_offset or byte_offset:
-            line_offset_step = min(max(line_offset, -127), 127)
-            byte_offset_step = min(max(byte_offset, 0), 254)
-            result.extend((byte_offset_step, to_byte(line_offset_step)))
-            line_offset -= line_offset_step
-            byte_offset -= byte_offset_step
+        result = encode_lnotab_entries(byte_offset, line_offset, 254, -127, 127)
         line_offset = starts_line - cur_lineno
         return result
 
-    def _encode_varint(num: int):
+    def _encode_varint(num: int, out: bytearray):
         """
         Encode unsigned integer into variable-length format.
         """
         continue_flag = 0b01 << 6
         stop_flag = 0b00 << 6
         while num >= 0x40:
-            yield (num & 0x3F) | continue_flag
+            out.append((num & 0x3F) | continue_flag)
             num >>= 6
-        yield num | stop_flag
+        out.append(num | stop_flag)
 
-    def _encode_svarint(num: int):
+    def _encode_svarint(num: int, out: bytearray):
         """
         Encode signed integer into variable-length format.
         """
         unsigned_value = (((-num) << 1) | 1) if num < 0 else (num << 1)
-        yield from _encode_varint(unsigned_value)
+        _encode_varint(unsigned_value, out)
 
     def _encode_bytecode_to_entries_py311(line_offset: int, byte_offset: int):
+        entries = bytearray()
         if not byte_offset:
-            return []
-        if 0 < byte_offset <= 8:
-            entry_head = 0b1_1101_000 | (byte_offset - 1)
-            return [entry_head, *list(_encode_svarint(line_offset))]
-        return [
-            *_encode_bytecode_to_entries_py311(line_offset, 8),
-            *_encode_bytecode_to_entries_py311(line_offset, byte_offset - 8),
-        ]
+            return entries
+        encoded_line_offset = bytearray()
+        _encode_svarint(line_offset, encoded_line_offset)
+        # Each entry covers at most 8 code units
+        while byte_offset > 0:
+            entry_size = min(byte_offset, 8)
+            entries.append(0b1_1101_000 | (entry_size - 1))
+            entries += encoded_line_offset
+            byte_offset -= entry_size
+        return entries
 
     def calc_linetable_py311(starts_line: int | None, code_length: int):
         """
@@ -340,7 +397,27 @@ def compile_exception_table():
     ...
 
 
-def stacksize(instructions: list[Instruction]) -> float:
+def straight_line_stacksize(instructions: list[Instruction]) -> int:
+    """
+    Calculates the maximum stack size of instructions without any jump, the
+    instructions are executed one by one, so a single pass is enough.
+
+    Args:
+        instructions (list[Instruction]): The list of instructions.
+
+    Returns:
+        int: The maximum stack size.
+    """
+    cur_stack = max_stack = 0
+    # The stack effect of the last instruction is not needed.
+    for instr in instructions[:-1]:
+        cur_stack += calc_stack_effect(instr, jump=False)
+        if cur_stack > max_stack:
+            max_stack = cur_stack
+    return max_stack
+
+
+def stacksize(instructions: list[Instruction]) -> int:
     """
     Calculates the maximum stack size before each opcode is called.
 
@@ -350,12 +427,21 @@ def stacksize(instructions: list[Instruction]) -> float:
     Returns:
         int: The maximum stack size.
     """
-    max_stack = [float("-inf")] * len(instructions)
+    if not any(
+        OPCODE_CLASS[instr.opcode] & CLS_ALL_JUMP for instr in instructions
+    ):
+        return straight_line_stacksize(instructions)
+
+    n_instrs = len(instructions)
+    # None means the instruction is not reached yet.
+    max_stack: list[int | None] = [None] * n_instrs
+    instr_idx = index_by_identity(instructions)
 
     max_stack[0] = 0
 
-    queue = []
-    queue.append(0)
+    queue = deque([0])
+    in_queue = bytearray(n_instrs)
+    in_queue[0] = 1
 
     def update_stacksize(lasti: int, nexti: int, stack_effect: int):
         """
@@ -369,38 +455,86 @@ def stacksize(instructions: list[Instruction]) -> float:
         Returns:
             None
         """
+        new_max = max_stack[lasti] + stack_effect
         old_max = max_stack[nexti]
-        max_stack[nexti] = max(
-            max_stack[nexti], max_stack[lasti] + stack_effect
-        )
-        if old_max != max_stack[nexti]:
-            if nexti not in queue:  # may be slow, we can use a flag.
+        if old_max is None or new_max > old_max:
+            max_stack[nexti] = new_max
+            if not in_queue[nexti]:
+                in_queue[nexti] = 1
                 queue.append(nexti)
 
-    while len(queue) > 0:
-        idx = queue[0]
-        del queue[0]
+    while queue:
+        idx = queue.popleft()
+        in_queue[idx] = 0
         instr = instructions[idx]
-        opname = instr.opname
-        if (
-            idx + 1 < len(instructions)
-            and instr.opname not in UNCONDITIONAL_JUMP
-        ):
+        opcode_class = OPCODE_CLASS[instr.opcode]
+        if idx + 1 < n_instrs and not opcode_class & CLS_UNCONDITIONAL_JUMP:
             stack_effect = calc_stack_effect(instr, jump=False)
             update_stacksize(idx, idx + 1, stack_effect)
 
-        if instr.opcode in opcode.hasjabs or instr.opcode in opcode.hasjrel:
+        if opcode_class & CLS_ALL_JUMP:
             stack_effect = calc_stack_effect(instr, jump=True)
-            target_idx = instructions.index(instr.jump_to)
+            target_idx = instr_idx[id(instr.jump_to)]
             update_stacksize(idx, target_idx, stack_effect)
 
-    # assert min(min_stack) >= 0 # min_stack may be a negative number when try: except is got.
-    return max(max_stack)
+    # NOTE: the stack size may be a negative number when try: except is got.
+    return max(size for size in max_stack if size is not None)
+
+
+def fuse_duplicate_loads(instructions: list[Instruction]) -> None:
+    """
+    Replaces the second one of two consecutive ``LOAD_FAST`` of the same
+    local with a ``DUP_TOP``, which skips the lookup and the unbound check.
+
+    It does nothing on Python 3.11+, where the interpreter quickens
+    consecutive loads into ``LOAD_FAST__LOAD_FAST`` by itself, and a
+    ``COPY`` would break that pair into two dispatches.
+
+    The instruction is rewritten in place, so the jumps and line numbers
+    referring to it are kept. A load that is a jump target is not fused,
+    since the stack top is not the local when jumping into it.
+
+    Args:
+        instructions (list[Instruction]): The list of instructions.
+    """
+    if sys.version_info >= (3, 11):
+        return
+    jump_targets = {
+        id(instr.jump_to) for instr in instructions if instr.jump_to is not None
+    }
+    loaded_name = None
+    for instr in instructions:
+        if instr.opname != "LOAD_FAST":
+            loaded_name = None
+            continue
+        if (
+            instr.argval != loaded_name
+            or id(instr) in jump_targets
+            or instr.first_ex_arg is not None
+        ):
+            loaded_name = instr.argval
+            continue
+        # The copy leaves the same local on the stack top, so loaded_name
+        # is kept and the following loads of it are fused as well.
+        instr.opname, instr.arg, instr.argval = "DUP_TOP", None, None
+        instr.opcode = dis.opmap["DUP_TOP"]
 
 
 class PyCodeGen:
     """Helper to create new code object"""
 
+    __slots__ = (
+        "_frame",
+        "_origin_code",
+        "_code_options",
+        "_names_index",
+        "_varnames_index",
+        "_consts_index",
+        "_f_globals",
+        "_instructions",
+        "disable_eval_frame",
+    )
+
     def __init__(
         self, frame: types.FrameType, disable_eval_frame: bool = False
     ):
@@ -414,6 +548,13 @@ class PyCodeGen:
         self._frame = frame
         self._origin_code = frame.f_code
         self._code_options = gen_code_options(self._origin_code)
+        # The index tables of co_names, co_varnames and co_consts, they are
+        # used to find the index of an item in O(1) when generating code.
+        self._names_index = build_index(self._code_options["co_names"])
+        self._varnames_index = build_index(self._code_options["co_varnames"])
+        self._consts_index = build_index(
+            map(id, self._code_options["co_consts"])
+        )
         self.update_code_name("", is_resumed_fn=False)
         self._f_globals = frame.f_globals
         self._instructions = []
@@ -421,6 +562,39 @@ class PyCodeGen:
         if self.disable_eval_frame:
             self.gen_disable_eval_frame()
 
+    def _get_name_index(self, name: str) -> int:
+        idx = self._names_index.get(name)
+        if idx is None:
+            names = self._code_options["co_names"]
+            idx = len(names)
+            names.append(name)
+            self._names_index[name] = idx
+        return idx
+
+    def _get_varname_index(self, name: str) -> int:
+        idx = self._varnames_index.get(name)
+        if idx is None:
+            varnames = self._code_options["co_varnames"]
+            idx = len(varnames)
+            varnames.append(name)
+            self._varnames_index[name] = idx
+        return idx
+
+    def _set_varnames(self, varnames: list[str]):
+        self._code_options["co_varnames"] = varnames
+        self._varnames_index = build_index(varnames)
+
+    def _inputs_first_varnames(self, inputs) -> list[str]:
+        """
+        Get the varnames of origin code with inputs moved to the front.
+        """
+        inputs_set = set(inputs)
+        return [*inputs] + [
+            var_name
+            for var_name in self._origin_code.co_varnames
+            if var_name not in inputs_set
+        ]
+
     def insert_prefix_instructions(self):
         """
         Insert prefix instructions to the instruction list.
@@ -433,13 +607,13 @@ class PyCodeGen:
         if sys.version_info >= (3, 11):
             if self._code_options["co_cellvars"]:
                 # Insert MAKE_CELL
-                name_map = list(
+                name_index = build_index(
                     OrderedSet(self._code_options["co_varnames"])
                     | OrderedSet(self._code_options["co_cellvars"])
                 )
 
                 for i in self._code_options["co_cellvars"]:
-                    idx: int = name_map.index(i)
+                    idx: int = name_index[i]
                     prefixes.append(gen_instr("MAKE_CELL", arg=idx, argval=i))
 
             if self._code_options["co_freevars"]:
@@ -453,7 +627,7 @@ class PyCodeGen:
 
             # Insert RESUME
             prefixes.append(gen_instr("RESUME", arg=0, argval=0))
-        self._instructions[:] = prefixes + self._instructions
+        self._instructions[:0] = prefixes
 
     def update_code_name(self, fn_name, is_resumed_fn):
         if is_resumed_fn:
@@ -479,6 +653,7 @@ class PyCodeGen:
             CodeType: The generated code object.
         """
         self.insert_prefix_instructions()
+        fuse_duplicate_loads(self._instructions)
         modify_instrs(self._instructions)
         modify_vars(self._instructions, self._code_options)
         new_code = gen_new_opcode(
@@ -500,32 +675,28 @@ class PyCodeGen:
             tuple: The resume function object and the inputs to the function.
 
         """
-        self._instructions = get_instructions(self._origin_code)
+        # Check the shared instructions first, so a resume point at
+        # RETURN_VALUE does not pay for copying the instructions.
         # TODO(dev): could give an example code here?
-        if self._instructions[index].opname == 'RETURN_VALUE':
+        origin_instrs = get_cached_instructions(self._origin_code)
+        if origin_instrs[index].opname == 'RETURN_VALUE':
             return None, OrderedSet()
+        self._instructions = get_instructions(self._origin_code)
         inputs = analysis_inputs(self._instructions, index)
         fn_name = ResumeFnNameFactory().next()
         stack_arg_str = fn_name + '_stack_{}'
-        self._instructions = (
-            [
-                gen_instr('LOAD_FAST', argval=stack_arg_str.format(i))
-                for i in range(stack_size)
-            ]
-            + [gen_instr('JUMP_FORWARD', jump_to=self._instructions[index])]
-            + self._instructions
-        )
+        stack_arg_names = [stack_arg_str.format(i) for i in range(stack_size)]
+        # Splice the prefix in place instead of concatenating new lists,
+        # which copies the whole instruction list twice.
+        self._instructions[:0] = [
+            *(gen_instr('LOAD_FAST', argval=name) for name in stack_arg_names),
+            gen_instr('JUMP_FORWARD', jump_to=self._instructions[index]),
+        ]
 
         self._code_options['co_argcount'] = len(inputs) + stack_size
         # inputs should be at the front of the co_varnames
-        self._code_options['co_varnames'] = list(
-            [stack_arg_str.format(i) for i in range(stack_size)]
-            + list(inputs)
-            + [
-                var_name
-                for var_name in self._origin_code.co_varnames
-                if var_name not in inputs
-            ]
+        self._set_varnames(
+            stack_arg_names + self._inputs_first_varnames(inputs)
         )
 
         self.update_code_name(fn_name, is_resumed_fn=True)
@@ -580,14 +751,7 @@ class PyCodeGen:
             function: The created function object.
         """
         self._code_options['co_argcount'] = len(inputs)
-        self._code_options['co_varnames'] = list(
-            list(inputs)
-            + [
-                var_name
-                for var_name in self._origin_code.co_varnames
-                if var_name not in inputs
-            ]
-        )
+        self._set_varnames(self._inputs_first_varnames(inputs))
         fn_name = ResumeFnNameFactory().next()
         self.update_code_name(fn_name, is_resumed_fn=True)
         new_code = self.gen_pycode()
@@ -602,10 +766,12 @@ class PyCodeGen:
         """
         # Python `list.index` will find an item equal to query, i.e. `query == item`
         # returns a value of True. Since `1 == True`, this will result in an incorrect
-        # index. To avoid this problem, we use id for comparison.
-        if not list_contain_by_id(self._code_options["co_consts"], value):
+        # index. To avoid this problem, we use id as the key of const index.
+        idx = self._consts_index.get(id(value))
+        if idx is None:
+            idx = len(self._code_options["co_consts"])
             self._code_options["co_consts"].append(value)
-        idx = list_find_index_by_id(self._code_options["co_consts"], value)
+            self._consts_index[id(value)] = idx
         self._add_instr("LOAD_CONST", arg=idx, argval=value)
 
     def gen_print_log(self, message):
@@ -672,9 +838,9 @@ class PyCodeGen:
     def gen_load(self, name):
         if name in self.cell_free_storage:
             self.gen_load_deref(name)
-        elif name in self._code_options["co_varnames"]:
+        elif name in self._varnames_index:
             self.gen_load_fast(name)
-        elif name in self._code_options["co_names"]:
+        elif name in self._names_index:
             self.gen_load_global(name, push_null=False)
         else:
             raise InnerError(
@@ -708,9 +874,7 @@ class PyCodeGen:
         Args:
             name (str): The name of the global variable.
         """
-        if name not in self._code_options["co_names"]:
-            self._code_options["co_names"].append(name)
-        idx = self._code_options["co_names"].index(name)
+        idx = self._get_name_index(name)
         if sys.version_info >= (3, 11):
             idx <<= 1
             if push_null:
@@ -737,9 +901,7 @@ class PyCodeGen:
         Args:
             name (str): The name of the local variable.
         """
-        if name not in self._code_options["co_varnames"]:
-            self._code_options["co_varnames"].append(name)
-        idx = self._code_options["co_varnames"].index(name)
+        idx = self._get_varname_index(name)
         self._add_instr("LOAD_FAST", arg=idx, argval=name)
 
     def gen_load_deref(self, name):
@@ -757,39 +919,27 @@ class PyCodeGen:
         self._add_instr("LOAD_DEREF", arg=idx, argval=name)
 
     def gen_load_attr(self, name: str):
-        if name not in self._code_options["co_names"]:
-            self._code_options["co_names"].append(name)
-        idx = self._code_options["co_names"].index(name)
+        idx = self._get_name_index(name)
         self._add_instr("LOAD_ATTR", arg=idx, argval=name)
 
     def gen_store_attr(self, name: str):
-        if name not in self._code_options["co_names"]:
-            self._code_options["co_names"].append(name)
-        idx = self._code_options["co_names"].index(name)
+        idx = self._get_name_index(name)
         self._add_instr("STORE_ATTR", arg=idx, argval=name)
 
     def gen_delete_attr(self, name: str):
-        if name not in self._code_options["co_names"]:
-            self._code_options["co_names"].append(name)
-        idx = self._code_options["co_names"].index(name)
+        idx = self._get_name_index(name)
         self._add_instr("DELETE_ATTR", arg=idx, argval=name)
 
     def gen_load_method(self, name: str):
-        if name not in self._code_options["co_names"]:
-            self._code_options["co_names"].append(name)
-        idx = self._code_options["co_names"].index(name)
+        idx = self._get_name_index(name)
         self._add_instr("LOAD_METHOD", arg=idx, argval=name)
 
     def gen_delete_global(self, name: str):
-        if name not in self._code_options["co_names"]:
-            self._code_options["co_names"].append(name)
-        idx = self._code_options["co_names"].index(name)
+        idx = self._get_name_index(name)
         self._add_instr("DELETE_GLOBAL", arg=idx, argval=name)
 
     def gen_import_name(self, name: str):
-        if name not in self._code_options["co_names"]:
-            self._code_options["co_names"].append(name)
-        idx = self._code_options["co_names"].index(name)
+        idx = self._get_name_index(name)
         self._add_instr("IMPORT_NAME", arg=idx, argval=name)
 
     def gen_push_null(self):
@@ -797,25 +947,19 @@ class PyCodeGen:
             self._add_instr("PUSH_NULL")
         else:
             # There is no PUSH_NULL bytecode before python3.11, so we push
-            # a NULL element to the stack through the following bytecode
-            self.gen_load_const(0)
+            # a NULL element to the stack through the following bytecode.
+            # `None.__class__` is a data descriptor rather than a method, so
+            # LOAD_METHOD pushes [NULL, NoneType], then we pop the NoneType.
             self.gen_load_const(None)
-            self.gen_import_name('sys')
-            self.gen_store_fast('sys')
-            self.gen_load_fast('sys')
-            self.gen_load_method('getsizeof')
+            self.gen_load_method('__class__')
             self.gen_pop_top()
 
     def gen_store_fast(self, name):
-        if name not in self._code_options["co_varnames"]:
-            self._code_options["co_varnames"].append(name)
-        idx = self._code_options["co_varnames"].index(name)
+        idx = self._get_varname_index(name)
         self._add_instr("STORE_FAST", arg=idx, argval=name)
 
     def gen_store_global(self, name):
-        if name not in self._code_options["co_names"]:
-            self._code_options["co_names"].append(name)
-        idx = self._code_options["co_names"].index(name)
+        idx = self._get_name_index(name)
         self._add_instr("STORE_GLOBAL", arg=idx, argval=name)
 
     def gen_store_deref(self, name):
@@ -878,7 +1022,11 @@ class PyCodeGen:
             return
         if sys.version_info < (3, 11):
             raise InnerError("gen_kw_names is not supported before python3.11")
+        # kw_names is compared by value, the equal tuple can be reused.
         if kw_names not in self._code_options["co_consts"]:
+            self._consts_index[id(kw_names)] = len(
+                self._code_options["co_consts"]
+            )
             self._code_options["co_consts"].append(kw_names)
         idx = self._code_options["co_consts"].index(kw_names)
         self._add_instr("KW_NAMES", arg=idx, argval=kw_names)
@@ -1003,6 +1151,10 @@ class PyCodeGen:
         return instr
 
     def _insert_instr(self, index, *args, **kwargs):
+        # NOTE: list.insert shifts every instruction after index, so calling
+        # it in a loop is quadratic. To insert several instructions, collect
+        # them first and splice them in once with a slice assignment. It is
+        # used by OpcodeExecutor._break_graph_in_jump to insert one jump.
         instr = gen_instr(*args, **kwargs)
         self._instructions.insert(index, instr)
 
@@ -793,34 +793,35 @@ Dispatcher.register(
 # ```
 
 # Constant
+# NOTE: The handlers call the operator function on the python values directly,
+# so only one handler is needed for each operator, registering it once per
+# magic method only adds duplicate patterns that slow down the dispatch.
 for unary_fn in UNARY_OPS:
-    for magic_method in magic_method_builtin_dispatch(unary_fn):
-        Dispatcher.register(
-            unary_fn,
-            ("ConstantVariable",),
-            partial(
-                lambda fn, var: VariableFactory.from_value(
-                    fn(var.get_py_value()),
-                    var.graph,
-                    tracker=DummyTracker([var]),
-                ),
-                unary_fn,
+    Dispatcher.register(
+        unary_fn,
+        ("ConstantVariable",),
+        partial(
+            lambda fn, var: VariableFactory.from_value(
+                fn(var.get_py_value()),
+                var.graph,
+                tracker=DummyTracker([var]),
             ),
-        )
+            unary_fn,
+        ),
+    )
 for binary_fn in BINARY_OPS:
-    for magic_method in magic_method_builtin_dispatch(binary_fn):
-        Dispatcher.register(
-            binary_fn,
-            ("ConstantVariable", "ConstantVariable"),
-            partial(
-                lambda fn, var, other: VariableFactory.from_value(
-                    fn(var.get_py_value(), other.get_py_value()),
-                    var.graph,
-                    tracker=DummyTracker([var, other]),
-                ),
-                binary_fn,
+    Dispatcher.register(
+        binary_fn,
+        ("ConstantVariable", "ConstantVariable"),
+        partial(
+            lambda fn, var, other: VariableFactory.from_value(
+                fn(var.get_py_value(), other.get_py_value()),
+                var.graph,
+                tracker=DummyTracker([var, other]),
             ),
-        )
+            binary_fn,
+        ),
+    )
 # Tensor
 fallback_tensor_unary_method = {
     int,
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-import operator
+import sys
 import types
-from functools import cached_property, reduce
+from functools import cached_property
 from typing import TYPE_CHECKING, Any
 
 import numpy as np
@@ -70,6 +70,9 @@ DTYPE_ABBRS = {
     paddle.bool: 'bool',
 }
 
+# Free vars used by the guard of TensorVariable, shared by all guards.
+TENSOR_GUARD_FREE_VARS = {"MetaInfo": MetaInfo}
+
 
 class ConstantVariable(VariableBase):
     """
@@ -205,6 +208,22 @@ class PrintStmtVariable(VariableBase):
 
 IMPLEMENTED_TENSOR_PROPERTIES = set()
 
+# The attributes of Tensor that can be read from MetaInfo directly.
+TENSOR_META_ATTRS = frozenset(
+    ["dtype", "type", "name", "persistable", "stop_gradient"]
+)
+
+# The methods of Tensor that are simulated by a builtin function.
+TENSOR_METHOD_TO_BUILTIN_FN = {
+    "dim": paddle.rank,
+    "numel": tensor_numel,
+    "ndimension": paddle.rank,
+    "is_tensor": paddle.is_tensor,
+    "is_complex": paddle.is_complex,
+    "is_integer": paddle.is_integer,
+    "is_floating_point": paddle.is_floating_point,
+}
+
 
 def tensor_property(func):
     IMPLEMENTED_TENSOR_PROPERTIES.add(func.__name__)
@@ -299,6 +318,9 @@ class TensorVariable(VariableBase):
             )
         self.origin_meta = self.meta
         self.var_name = TensorVariable.var_name_generator.next()
+        self._out_var_name = sys.intern(
+            f"{self.graph.OUT_VAR_PREFIX}{self.var_name}"
+        )
         self.graph.side_effects.record_mutable_variable(self)
 
     def __len__(self):
@@ -335,7 +357,7 @@ class TensorVariable(VariableBase):
 
     @property
     def out_var_name(self):
-        return f"{self.graph.OUT_VAR_PREFIX}{self.var_name}"
+        return self._out_var_name
 
     def _reconstruct(self, codegen: PyCodeGen):
         codegen.gen_load_fast(self.out_var_name)
@@ -346,10 +368,12 @@ class TensorVariable(VariableBase):
 
         return [
             StringifyExpression(
-                f"MetaInfo.from_tensor({{}}).guard_str() == '{self.origin_meta.guard_str()}'",
+                "MetaInfo.from_tensor({}).guard_str() == '"
+                + self.origin_meta.guard_str()
+                + "'",
                 [frame_value_tracer],
                 union_free_vars(
-                    {"MetaInfo": MetaInfo},
+                    TENSOR_GUARD_FREE_VARS,
                     frame_value_tracer.free_vars,
                 ),
             )
@@ -395,7 +419,7 @@ class TensorVariable(VariableBase):
         """
         from .container import ListVariable
 
-        perm = list(range(len(self.meta.shape) - 1, -1, -1))
+        perm = list(range(self.meta.ndim - 1, -1, -1))
         perm_var = ListVariable(perm, self.graph, tracker=ConstTracker(perm))
         assert perm_var is not None
         out = self.graph.call_paddle_api(paddle.transpose, self, perm_var)
@@ -407,7 +431,7 @@ class TensorVariable(VariableBase):
         Return a ConstantVariable object that represents the number of dimensions of the wrapped value of this TensorVariable.
         """
         return ConstantVariable(
-            len(self.meta.shape), self.graph, DummyTracker([self])
+            self.meta.ndim, self.graph, DummyTracker([self])
         )
 
     @tensor_property
@@ -420,7 +444,7 @@ class TensorVariable(VariableBase):
             raise BreakGraphError(
                 f"Getting size for a dynamic shape tensor causes graph break. shape = {self.meta.shape}"
             )
-        elements = reduce(operator.mul, self.meta.shape, 1)
+        elements = self.meta.numel()
         return ConstantVariable(elements, self.graph, DummyTracker([self]))
 
     @tensor_property
@@ -432,14 +456,14 @@ class TensorVariable(VariableBase):
         from .container import ListVariable
 
         return ListVariable(
-            self.meta.shape, self.graph, tracker=DummyTracker([self])
+            list(self.meta.shape), self.graph, tracker=DummyTracker([self])
         )
 
     def numel(self):
         return self.size
 
     def len(self):
-        if len(self.meta.shape) == 0:
+        if self.meta.ndim == 0:
             raise InnerError("len() of a 0-D tensor is wrong")
         first_dim = self.meta.shape[0]
         if first_dim == -1:
@@ -472,16 +496,7 @@ class TensorVariable(VariableBase):
             raise FallbackError(
                 "default argument for getattr is not implemented"
             )
-        method_name_to_builtin_fn = {
-            "dim": paddle.rank,
-            "numel": tensor_numel,
-            "ndimension": paddle.rank,
-            "is_tensor": paddle.is_tensor,
-            "is_complex": paddle.is_complex,
-            "is_integer": paddle.is_integer,
-            "is_floating_point": paddle.is_floating_point,
-        }
-        if name in ["dtype", "type", "name", "persistable", "stop_gradient"]:
+        if name in TENSOR_META_ATTRS:
             if name == "name" and self.meta.name.startswith(
                 "infer_meta_variable_tmp"
             ):
@@ -493,11 +508,11 @@ class TensorVariable(VariableBase):
             )
         elif name in IMPLEMENTED_TENSOR_PROPERTIES:
             return getattr(self, name)
-        elif name in method_name_to_builtin_fn:
+        elif name in TENSOR_METHOD_TO_BUILTIN_FN:
             # TODO: backward, gradient
             from .callable import BuiltinVariable
 
-            builtin_fn = method_name_to_builtin_fn[name]
+            builtin_fn = TENSOR_METHOD_TO_BUILTIN_FN[name]
 
             return BuiltinVariable(
                 builtin_fn, self.graph, DanglingTracker()
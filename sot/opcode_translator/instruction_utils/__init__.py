@@ -1,10 +1,14 @@
 from .instruction_utils import (  # noqa: F401
     Instruction,
+    build_index,
     calc_offset_from_bytecode_offset,
     calc_stack_effect,
     convert_instruction,
+    copy_instructions,
     gen_instr,
+    get_cached_instructions,
     get_instructions,
+    index_by_identity,
     instrs_info,
     modify_extended_args,
     modify_instrs,
@@ -2,14 +2,23 @@ from __future__ import annotations
 
 import dataclasses
 import dis
+import functools
 import sys
+import weakref
 from typing import TYPE_CHECKING, Any
 
 from ...utils import InnerError
-from .opcode_info import ABS_JUMP, ALL_JUMP, REL_BWD_JUMP, REL_JUMP
+from .opcode_info import (
+    CLS_ABS_JUMP,
+    CLS_ALL_JUMP,
+    CLS_REL_BWD_JUMP,
+    CLS_REL_JUMP,
+    OPCODE_CLASS,
+)
 
 if TYPE_CHECKING:
     import types
+    from typing import Iterable
 
 
 @dataclasses.dataclass
@@ -33,14 +42,42 @@ class Instruction:
         return id(self)
 
 
+def index_by_identity(instructions: list[Instruction]) -> dict[int, int]:
+    """
+    Map the id of each instruction to its index in the list.
+
+    Instructions must be looked up by identity, `list.index` falls back to
+    the field-wise dataclass __eq__ and scans the whole list.
+    """
+    return {id(instr): idx for idx, instr in enumerate(instructions)}
+
+
+def build_index(items: Iterable[Any]) -> dict[Any, int]:
+    """
+    Build a dict that maps each item to the index of its first occurrence,
+    which is the same as what `list.index` returns.
+    """
+    index = {}
+    for idx, item in enumerate(items):
+        index.setdefault(item, idx)
+    return index
+
+
 def gen_instr(name, arg=None, argval=None, gened=True, jump_to=None):
+    # NOTE: Instructions are compared and indexed by identity (jump_to, id
+    # maps), so every call must return a fresh object, sharing a prebuilt
+    # instance is not safe. Positional arguments skip the keyword matching
+    # of the dataclass __init__, which is the main cost here.
     return Instruction(
-        opcode=dis.opmap[name],
-        opname=name,
-        arg=arg,
-        argval=argval,
-        is_generated=gened,
-        jump_to=jump_to,
+        dis.opmap[name],
+        name,
+        arg,
+        argval,
+        None,  # offset
+        None,  # starts_line
+        False,  # is_jump_target
+        jump_to,
+        gened,  # is_generated
     )
 
 
@@ -67,11 +104,81 @@ def convert_instruction(instr: dis.Instruction) -> Instruction:
     )
 
 
+# The parsed instructions of code objects, they should never be modified,
+# get_instructions returns a copy of them. It's keyed by id(code) because
+# code objects compare by value, and two equal code objects may still
+# differ in line number info. The entry is dropped when the code dies.
+_INSTRUCTIONS_CACHE: dict[int, list[Instruction]] = {}
+
+
+def copy_instructions(instrs: list[Instruction]) -> list[Instruction]:
+    """
+    Copy the instructions, the jump_to of the copied instructions point to the
+    copied targets.
+
+    Args:
+        instrs (list[Instruction]): The instructions to be copied.
+
+    Returns:
+        list[Instruction]: The copied instructions.
+    """
+    copied = []
+    copied_map = {}
+    for instr in instrs:
+        # Faster than copy.copy, which goes through __reduce_ex__.
+        new_instr = object.__new__(Instruction)
+        new_instr.__dict__.update(instr.__dict__)
+        copied.append(new_instr)
+        copied_map[id(instr)] = new_instr
+    for new_instr in copied:
+        if new_instr.jump_to is not None:
+            new_instr.jump_to = copied_map[id(new_instr.jump_to)]
+    return copied
+
+
 def get_instructions(code: types.CodeType) -> list[Instruction]:
     """
     Returns parsed instructions from the given code object and exclude
     any opcodes that contain `EXTENDED_ARG`.
 
+    The parsed result is cached for each code object, and a copy of it is
+    returned, so the caller can modify the instructions freely.
+
+    Args:
+        code (types.CodeType): The code object to extract instructions from.
+
+    Returns:
+        list[Instruction]: A list of Instruction objects representing the
+            bytecode instructions in the code object.
+    """
+    return copy_instructions(get_cached_instructions(code))
+
+
+def get_cached_instructions(code: types.CodeType) -> list[Instruction]:
+    """
+    Returns the cached parsed instructions of the given code object, the
+    result is shared and must not be modified, use `get_instructions` to
+    get a modifiable copy.
+
+    Args:
+        code (types.CodeType): The code object to extract instructions from.
+
+    Returns:
+        list[Instruction]: The shared list of parsed instructions.
+    """
+    code_id = id(code)
+    instrs = _INSTRUCTIONS_CACHE.get(code_id)
+    if instrs is None:
+        instrs = _INSTRUCTIONS_CACHE[code_id] = parse_instructions(code)
+        weakref.finalize(code, _INSTRUCTIONS_CACHE.pop, code_id, None)
+    return instrs
+
+
+def parse_instructions(code: types.CodeType) -> list[Instruction]:
+    """
+    Parses the instructions from the given code object and exclude any
+    opcodes that contain `EXTENDED_ARG`.
+
     Args:
         code (types.CodeType): The code object to extract instructions from.
 
@@ -82,7 +189,7 @@ def get_instructions(code: types.CodeType) -> list[Instruction]:
     # instrs do not contain EXTENDED_ARG
     instrs = list(map(convert_instruction, dis.get_instructions(code)))
     for instr in instrs:
-        if instr.opname in ALL_JUMP:
+        if OPCODE_CLASS[instr.opcode] & CLS_ALL_JUMP:
             origin_jump_target = calc_offset_from_bytecode_offset(
                 instr.argval, instrs
             )
@@ -165,18 +272,18 @@ def correct_jump_direction(instr: Instruction, arg: int) -> Instruction:
     Args:
         instr (Instruction): The instruction to be corrected.
     """
-    if instr.opname in ABS_JUMP:
+    if OPCODE_CLASS[instr.opcode] & CLS_ABS_JUMP:
         instr.arg = arg
         return instr
-    elif instr.opname in REL_JUMP:
+    elif OPCODE_CLASS[instr.opcode] & CLS_REL_JUMP:
         if arg < 0:
-            if instr.opname in REL_BWD_JUMP:
+            if OPCODE_CLASS[instr.opcode] & CLS_REL_BWD_JUMP:
                 forward_op_name = instr.opname.replace("BACKWARD", "FORWARD")
                 if forward_op_name not in dis.opmap:
                     raise InnerError(f"Unknown jump type {instr.opname}")
                 instr.opname = forward_op_name
                 instr.opcode = dis.opmap[forward_op_name]
-            else:  # instr.opname in REL_FWD_JUMP
+            else:  # OPCODE_CLASS[instr.opcode] & CLS_REL_FWD_JUMP
                 backward_op_name = instr.opname.replace("FORWARD", "BACKWARD")
                 if backward_op_name not in dis.opmap:
                     raise InnerError(f"Unknown jump type {instr.opname}")
@@ -207,7 +314,7 @@ def relocate_jump_target(instructions: list[Instruction]) -> None:
             extended_arg.append(instr)
             continue
 
-        if instr.opname in ALL_JUMP:
+        if OPCODE_CLASS[instr.opcode] & CLS_ALL_JUMP:
             assert instr.jump_to is not None
             assert instr.offset is not None
             # if jump target has extended_arg, should jump to the first extended_arg opcode
@@ -218,11 +325,11 @@ def relocate_jump_target(instructions: list[Instruction]) -> None:
             )
             assert jump_target is not None
 
-            if instr.opname in ABS_JUMP:
+            if OPCODE_CLASS[instr.opcode] & CLS_ABS_JUMP:
                 new_arg = jump_target
-            else:  # instr.opname in REL_JUMP
+            else:  # OPCODE_CLASS[instr.opcode] & CLS_REL_JUMP
                 new_arg = jump_target - instr.offset - 2
-                if instr.opname in REL_BWD_JUMP:
+                if OPCODE_CLASS[instr.opcode] & CLS_REL_BWD_JUMP:
                     new_arg = -new_arg
 
             if sys.version_info >= (3, 10):
@@ -301,19 +408,23 @@ def modify_vars(instructions, code_options):
     co_names = code_options['co_names']
     co_varnames = code_options['co_varnames']
     co_freevars = code_options['co_freevars']
+    # Map the names to their first index once, instead of scanning the
+    # name lists with `in` and `list.index` for every instruction.
+    varnames_index = build_index(co_varnames)
+    namemap, namemap_index = None, None
     for instrs in instructions:
         if instrs.opname == 'LOAD_FAST' or instrs.opname == 'STORE_FAST':
-            assert (
-                instrs.argval in co_varnames
-            ), f"`{instrs.argval}` not in {co_varnames}"
-            instrs.arg = co_varnames.index(instrs.argval)
+            idx = varnames_index.get(instrs.argval)
+            assert idx is not None, f"`{instrs.argval}` not in {co_varnames}"
+            instrs.arg = idx
         elif instrs.opname == "LOAD_DEREF" or instrs.opname == "STORE_DEREF":
             if sys.version_info >= (3, 11):
-                namemap = co_varnames + co_freevars
-                assert (
-                    instrs.argval in namemap
-                ), f"`{instrs.argval}` not in {namemap}"
-                instrs.arg = namemap.index(instrs.argval)
+                if namemap_index is None:
+                    namemap = co_varnames + co_freevars
+                    namemap_index = build_index(namemap)
+                idx = namemap_index.get(instrs.argval)
+                assert idx is not None, f"`{instrs.argval}` not in {namemap}"
+                instrs.arg = idx
 
 
 def calc_offset_from_bytecode_offset(
@@ -371,6 +482,12 @@ def instrs_info(instrs, mark=None, range=None):
     return ret
 
 
+@functools.lru_cache(maxsize=4096)
+def _stack_effect(opcode: int, arg: int | None, jump: bool | None) -> int:
+    # Real code only has a few distinct (opcode, arg, jump), so cache them.
+    return dis.stack_effect(opcode, arg, jump=jump)
+
+
 def calc_stack_effect(instr: Instruction, *, jump: bool | None = None) -> int:
     """
     Gets the stack effect of the given instruction. In Python 3.11, the stack effect of `CALL` is -1,
@@ -390,4 +507,4 @@ def calc_stack_effect(instr: Instruction, *, jump: bool | None = None) -> int:
             # NOTE(zrr1999): push_n = 1, pop_n = oparg + 2, stack_effect = push_n - pop_n = -oparg-1
             assert instr.arg is not None
             return -instr.arg - 1
-    return dis.stack_effect(instr.opcode, instr.arg, jump=jump)
+    return _stack_effect(instr.opcode, instr.arg, jump)
@@ -4,8 +4,13 @@ import dataclasses
 from enum import Enum
 
 from ...utils import InnerError, OrderedSet
-from .instruction_utils import Instruction
-from .opcode_info import ALL_JUMP, HAS_FREE, HAS_LOCAL, UNCONDITIONAL_JUMP
+from .instruction_utils import Instruction, index_by_identity
+from .opcode_info import (
+    CLS_ALL_JUMP,
+    CLS_HAS_LOCAL_OR_FREE,
+    CLS_UNCONDITIONAL_JUMP,
+    OPCODE_CLASS,
+)
 
 
 @dataclasses.dataclass
@@ -65,6 +70,7 @@ def analysis_inputs(
         set[str]: The analysis result.
     """
     root_state = State(OrderedSet(), OrderedSet(), OrderedSet())
+    instr_idx = index_by_identity(instructions)
 
     def fork(
         state: State, start: int, jump: bool, jump_target: int
@@ -85,21 +91,21 @@ def analysis_inputs(
             state.visited.add(i)
 
             instr = instructions[i]
-            if instr.opname in HAS_LOCAL | HAS_FREE:
+            if OPCODE_CLASS[instr.opcode] & CLS_HAS_LOCAL_OR_FREE:
                 if is_read_opcode(instr.opname) and instr.argval not in (
                     state.writes
                 ):
                     state.reads.add(instr.argval)
                 elif is_write_opcode(instr.opname):
                     state.writes.add(instr.argval)
-            elif instr.opname in ALL_JUMP:
+            elif OPCODE_CLASS[instr.opcode] & CLS_ALL_JUMP:
                 assert instr.jump_to is not None
-                target_idx = instructions.index(instr.jump_to)
+                target_idx = instr_idx[id(instr.jump_to)]
                 # Fork to two branches, jump or not
                 jump_branch = fork(state, i, True, target_idx)
                 not_jump_branch = (
                     fork(state, i, False, target_idx)
-                    if instr.opname not in UNCONDITIONAL_JUMP
+                    if not OPCODE_CLASS[instr.opcode] & CLS_UNCONDITIONAL_JUMP
                     else OrderedSet()
                 )
                 return jump_branch | not_jump_branch
@@ -152,6 +158,7 @@ def analysis_used_names_with_space(
     stop_instr_idx: int | None = None,
 ):
     root_state = SpaceState({}, {}, OrderedSet())
+    instr_idx = index_by_identity(instructions)
 
     def fork(
         state: SpaceState, start: int, jump: bool, jump_target: int
@@ -172,7 +179,7 @@ def analysis_used_names_with_space(
             state.visited.add(i)
 
             instr = instructions[i]
-            if instr.opname in HAS_LOCAL | HAS_FREE:
+            if OPCODE_CLASS[instr.opcode] & CLS_HAS_LOCAL_OR_FREE:
                 if is_read_opcode(instr.opname) and instr.argval not in (
                     state.writes
                 ):
@@ -181,14 +188,14 @@ def analysis_used_names_with_space(
                 elif is_write_opcode(instr.opname):
                     space = get_space(instr.opname)
                     state.writes[instr.argval] = space
-            elif instr.opname in ALL_JUMP:
+            elif OPCODE_CLASS[instr.opcode] & CLS_ALL_JUMP:
                 assert instr.jump_to is not None
-                target_idx = instructions.index(instr.jump_to)
+                target_idx = instr_idx[id(instr.jump_to)]
                 # Fork to two branches, jump or not
                 jump_branch = fork(state, i, True, target_idx)
                 not_jump_branch = (
                     fork(state, i, False, target_idx)
-                    if instr.opname not in UNCONDITIONAL_JUMP
+                    if not OPCODE_CLASS[instr.opcode] & CLS_UNCONDITIONAL_JUMP
                     else SpaceState({}, {}, OrderedSet())
                 )
                 return jump_branch | not_jump_branch
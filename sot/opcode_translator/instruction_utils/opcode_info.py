@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 import sys
 from enum import Enum
 
@@ -15,6 +17,52 @@ if sys.version_info >= (3, 11):
     UNCONDITIONAL_JUMP.add("JUMP_BACKWARD")
 
 
+def _to_opcodes(opnames):
+    return frozenset(
+        opcode.opmap[name] for name in opnames if name in opcode.opmap
+    )
+
+
+# The opcode number version of the sets above, they are used to build
+# OPCODE_CLASS below.
+REL_BWD_JUMP_OPS = _to_opcodes(REL_BWD_JUMP)
+REL_FWD_JUMP_OPS = _to_opcodes(REL_FWD_JUMP)
+ABS_JUMP_OPS = _to_opcodes(ABS_JUMP)
+HAS_LOCAL_OPS = _to_opcodes(HAS_LOCAL)
+HAS_FREE_OPS = _to_opcodes(HAS_FREE)
+UNCONDITIONAL_JUMP_OPS = _to_opcodes(UNCONDITIONAL_JUMP)
+
+# Opcode class bit flags, the class of an opcode can be checked by
+# `OPCODE_CLASS[instr.opcode] & CLS_XXX`, which only needs a list index.
+CLS_REL_BWD_JUMP = 1 << 0
+CLS_REL_FWD_JUMP = 1 << 1
+CLS_ABS_JUMP = 1 << 2
+CLS_HAS_LOCAL = 1 << 3
+CLS_HAS_FREE = 1 << 4
+CLS_UNCONDITIONAL_JUMP = 1 << 5
+CLS_REL_JUMP = CLS_REL_BWD_JUMP | CLS_REL_FWD_JUMP
+CLS_ALL_JUMP = CLS_REL_JUMP | CLS_ABS_JUMP
+CLS_HAS_LOCAL_OR_FREE = CLS_HAS_LOCAL | CLS_HAS_FREE
+
+
+def _build_opcode_class():
+    opcode_class = [0] * 256
+    for opcodes, flag in [
+        (REL_BWD_JUMP_OPS, CLS_REL_BWD_JUMP),
+        (REL_FWD_JUMP_OPS, CLS_REL_FWD_JUMP),
+        (ABS_JUMP_OPS, CLS_ABS_JUMP),
+        (HAS_LOCAL_OPS, CLS_HAS_LOCAL),
+        (HAS_FREE_OPS, CLS_HAS_FREE),
+        (UNCONDITIONAL_JUMP_OPS, CLS_UNCONDITIONAL_JUMP),
+    ]:
+        for op in opcodes:
+            opcode_class[op] |= flag
+    return opcode_class
+
+
+OPCODE_CLASS: list[int] = _build_opcode_class()
+
+
 class JumpDirection(Enum):
     FORWARD = "FORWARD"
     BACKWARD = "BACKWARD"
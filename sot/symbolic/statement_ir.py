@@ -149,10 +149,29 @@ class StatementIR:
 
     def __init__(self, name: str):
         self.name = name
+        self._cached_hash = None
         self.inputs = []  # list of Symbol | PythonObj
         self.outputs = []  # list of Symbol | PythonObj
         self.statements = []  # list of Statement
 
+    @property
+    def inputs(self):
+        return self._inputs
+
+    @inputs.setter
+    def inputs(self, inputs):
+        self._inputs = inputs
+        self._cached_hash = None
+
+    @property
+    def outputs(self):
+        return self._outputs
+
+    @outputs.setter
+    def outputs(self, outputs):
+        self._outputs = outputs
+        self._cached_hash = None
+
     def __len__(self):
         return len(self.statements)
 
@@ -165,13 +184,25 @@ class StatementIR:
 
     def add_input(self, input):
         self.inputs.append(input)
+        self._cached_hash = None
 
     def add_output(self, output):
         self.outputs.append(output)
+        self._cached_hash = None
 
     def add_statement(self, statement):
         assert isinstance(statement, Statement)
         self.statements.append(statement)
+        self._cached_hash = None
+
+    def cached_hash(self) -> int:
+        """
+        Get the hash of str(self), which is computed once and reused until
+        the SIR is modified.
+        """
+        if self._cached_hash is None:
+            self._cached_hash = hash(str(self))
+        return self._cached_hash
 
     def analyse_inputs(self):
         used_symbols = OrderedSet()
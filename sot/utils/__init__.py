@@ -34,12 +34,11 @@ from .utils import (  # noqa: F401
     is_clean_code,
     is_paddle_api,
     is_strict_mode,
-    list_contain_by_id,
-    list_find_index_by_id,
     log,
     log_do,
     map_if,
     map_if_extend,
+    map_structure_extend,
     meta_str,
     min_graph_size,
     no_eval_frame,
@@ -3,20 +3,22 @@ from __future__ import annotations
 import builtins
 import inspect
 import os
+import sys
+import threading
 import time
 import types
 import weakref
 from collections import OrderedDict
 from contextlib import contextmanager
 from enum import Enum
-from typing import Any, Generic, Iterable, Iterator, TypeVar
+from typing import Generic, Iterable, Iterator, TypeVar
 from weakref import WeakValueDictionary
 
 import numpy as np
 
 import paddle
 from paddle.framework import Program
-from paddle.utils import flatten, map_structure
+from paddle.utils import flatten, is_sequence, map_structure
 
 from .paddle_api_config import (
     break_graph_set,
@@ -36,14 +38,25 @@ def min_graph_size():
 
 
 class Singleton(Generic[T]):
+    """
+    Lazily create the only instance of the decorated class on the first call.
+    The creation is guarded by a lock, so the instance is created only once
+    even if it's first requested from multiple threads.
+    """
+
     def __init__(self, cls: type[T]):
         self._cls = cls
-        self._instance = {}
+        self._instance: T | None = None
+        self._lock = threading.RLock()
 
     def __call__(self) -> T:
-        if self._cls not in self._instance:
-            self._instance[self._cls] = self._cls()
-        return self._instance[self._cls]
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                instance = self._instance
+                if instance is None:
+                    instance = self._instance = self._cls()
+        return instance
 
 
 class NameGenerator:
@@ -52,7 +65,8 @@ class NameGenerator:
         self.prefix = prefix
 
     def next(self):
-        name = self.prefix + str(self.counter)
+        # Interned names can be compared and used as dict keys faster.
+        name = sys.intern(self.prefix + str(self.counter))
         self.counter += 1
         return name
 
@@ -196,23 +210,44 @@ def flatten_extend(structure):
             yield item
 
 
-def map_if_extend(structure, pred, true_fn, false_fn):
-    """support extended structures like slice and SliceVariable"""
+def map_structure_extend(structure, fn):
+    """
+    Walk the nested structure once and apply fn to every leaf, the start, stop
+    and step of slice are treated as leaves too.
 
-    def wrapped_pred(x):
-        if isinstance(x, slice):
-            return True
-        return pred(x)
+    Args:
+        structure: The nested list/tuple/dict structure.
+        fn: The function applied to every leaf.
+
+    Returns:
+        A new structure with the same layout, whose leaves are converted by fn.
+    """
+    if isinstance(structure, dict):
+        # Assign into a copy, type(structure)(items) fails for the dict
+        # subclasses taking other constructor arguments, e.g. defaultdict.
+        new_structure = structure.copy()
+        for key, value in structure.items():
+            new_structure[key] = map_structure_extend(value, fn)
+        return new_structure
+    if isinstance(structure, slice):
+        return slice(
+            map_structure_extend(structure.start, fn),
+            map_structure_extend(structure.stop, fn),
+            map_structure_extend(structure.step, fn),
+        )
+    if is_sequence(structure):
+        items = [map_structure_extend(item, fn) for item in structure]
+        if hasattr(structure, "_fields"):
+            # namedtuple
+            return type(structure)(*items)
+        return type(structure)(items)
+    return fn(structure)
 
-    def wrapped_true_fn(x):
-        if isinstance(x, (slice)):
-            l = [x.start, x.stop, x.step]
-            l = map_if_extend(l, pred, true_fn, false_fn)
-            return slice(*l)
-        return true_fn(x)
 
-    return map_if(
-        structure, pred=wrapped_pred, true_fn=wrapped_true_fn, false_fn=false_fn
+def map_if_extend(structure, pred, true_fn, false_fn):
+    """support extended structures like slice and SliceVariable"""
+    return map_structure_extend(
+        structure, lambda x: true_fn(x) if pred(x) else false_fn(x)
     )
 
 
@@ -284,14 +319,6 @@ def is_clean_code() -> bool:
     return os.environ.get('CLEAN_CODE', "False") == "True"
 
 
-def list_find_index_by_id(li: list[Any], item: Any) -> int:
-    return [id(it) for it in li].index(id(item))
-
-
-def list_contain_by_id(li: list[Any], item: Any) -> int:
-    return id(item) in [id(it) for it in li]
-
-
 def get_unbound_method(obj, name):
     # TODO(dev): Consider the case of patching methods to instances
     return getattr(obj.__class__, name)
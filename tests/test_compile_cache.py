@@ -0,0 +1,64 @@
+import unittest
+
+import paddle
+from sot.symbolic.compile_cache import FallbackWrapper, gen_partial_program_key
+
+
+class FakeSIR:
+    name = "fake_sir"
+
+
+class FakePartialProgram:
+    def __init__(self):
+        self.call_count = 0
+
+    def __call__(self, inputs):
+        self.call_count += 1
+        return [x + 1 for x in inputs]
+
+
+class FakeCompiledFn:
+    def __init__(self):
+        self.build_count = 0
+
+    def __call__(self, inputs):
+        return [x + 1 for x in inputs]
+
+    def get_concrete_program(self, inputs):
+        self.build_count += 1
+        return None, FakePartialProgram()
+
+
+class TestPartialProgramKey(unittest.TestCase):
+    def test_same_meta_same_key(self):
+        x = paddle.rand([2, 3])
+        y = paddle.rand([2, 3])
+        self.assertEqual(
+            gen_partial_program_key(((x, 1),), {}),
+            gen_partial_program_key(((y, 1),), {}),
+        )
+
+    def test_alias_and_meta_change_key(self):
+        x = paddle.rand([2, 3])
+        y = paddle.rand([2, 3])
+        z = paddle.rand([3, 2])
+        key = gen_partial_program_key(((x, y),), {})
+        self.assertNotEqual(key, gen_partial_program_key(((x, x),), {}))
+        self.assertNotEqual(key, gen_partial_program_key(((x, z),), {}))
+
+    def test_unsupported_argument(self):
+        self.assertIsNone(gen_partial_program_key((object(),), {}))
+
+
+class TestFallbackWrapper(unittest.TestCase):
+    def test_reuse_partial_program(self):
+        compiled_fn = FakeCompiledFn()
+        wrapper = FallbackWrapper(compiled_fn, FakeSIR())
+        wrapper((paddle.rand([2, 3]), paddle.rand([4])))
+        wrapper((paddle.rand([2, 3]), paddle.rand([4])))
+        self.assertEqual(compiled_fn.build_count, 1)
+        self.assertEqual(wrapper.partial_program.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
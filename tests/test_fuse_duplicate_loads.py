@@ -0,0 +1,70 @@
+import sys
+import unittest
+
+from test_case_base import TestCaseBase
+
+import paddle
+from sot.opcode_translator.executor.pycode_generator import fuse_duplicate_loads
+from sot.opcode_translator.instruction_utils import gen_instr
+
+
+def square_add(x: paddle.Tensor, y: paddle.Tensor):
+    z = x * x
+    return z + y + y
+
+
+class TestFuseDuplicateLoads(unittest.TestCase):
+    @unittest.skipIf(
+        sys.version_info >= (3, 11), "Loads are not fused on Python 3.11+"
+    )
+    def test_fuse_to_dup_top(self):
+        instrs = [
+            gen_instr("LOAD_FAST", argval="x"),
+            gen_instr("LOAD_FAST", argval="x"),
+            gen_instr("LOAD_FAST", argval="x"),
+            gen_instr("LOAD_FAST", argval="y"),
+        ]
+        fuse_duplicate_loads(instrs)
+        self.assertEqual(
+            [instr.opname for instr in instrs],
+            ["LOAD_FAST", "DUP_TOP", "DUP_TOP", "LOAD_FAST"],
+        )
+
+    @unittest.skipIf(
+        sys.version_info >= (3, 11), "Loads are not fused on Python 3.11+"
+    )
+    def test_keep_jump_target(self):
+        first_load = gen_instr("LOAD_FAST", argval="x")
+        second_load = gen_instr("LOAD_FAST", argval="x")
+        instrs = [
+            gen_instr("JUMP_ABSOLUTE", jump_to=second_load),
+            first_load,
+            second_load,
+        ]
+        fuse_duplicate_loads(instrs)
+        self.assertEqual(second_load.opname, "LOAD_FAST")
+        self.assertIs(instrs[0].jump_to, second_load)
+
+    @unittest.skipIf(
+        sys.version_info < (3, 11), "Loads are fused before Python 3.11"
+    )
+    def test_no_fuse_since_py311(self):
+        instrs = [
+            gen_instr("LOAD_FAST", argval="x"),
+            gen_instr("LOAD_FAST", argval="x"),
+        ]
+        fuse_duplicate_loads(instrs)
+        self.assertEqual(
+            [instr.opname for instr in instrs], ["LOAD_FAST", "LOAD_FAST"]
+        )
+
+
+class TestFuseDuplicateLoadsResult(TestCaseBase):
+    def test_square_add(self):
+        self.assert_results(
+            square_add, paddle.to_tensor(2.0), paddle.to_tensor(3.0)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
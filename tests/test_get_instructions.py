@@ -0,0 +1,30 @@
+import unittest
+
+from sot.opcode_translator.instruction_utils import get_instructions
+
+
+def gen_code(source, first_line):
+    global_vars = {}
+    exec(
+        compile("\n" * (first_line - 1) + source, "<test>", "exec"), global_vars
+    )
+    return global_vars["foo"].__code__
+
+
+class TestGetInstructions(unittest.TestCase):
+    def test_equal_code_keeps_own_line_numbers(self):
+        source = "def foo(x):\n    return x + 1\n"
+        code_1 = gen_code(source, 1)
+        code_2 = gen_code(source, 10)
+        lines_1 = [instr.starts_line for instr in get_instructions(code_1)]
+        lines_2 = [instr.starts_line for instr in get_instructions(code_2)]
+        self.assertNotEqual(lines_1, lines_2)
+
+    def test_return_copy(self):
+        code = gen_code("def foo(x):\n    return x + 1\n", 1)
+        instrs = get_instructions(code)
+        self.assertIsNot(instrs[0], get_instructions(code)[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
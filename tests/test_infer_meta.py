@@ -0,0 +1,30 @@
+import unittest
+
+import paddle
+from sot.infer_meta import MetaInfo
+
+
+class TestMetaInfo(unittest.TestCase):
+    def test_meta_info_keeps_tensor_attributes(self):
+        x = paddle.rand([2, 3])
+        y = paddle.rand([2, 3])
+        x_meta = MetaInfo.from_tensor(x)
+        y_meta = MetaInfo.from_tensor(y)
+        # Equal metas are not shared, each one keeps its own tensor name.
+        self.assertEqual(x_meta, y_meta)
+        self.assertEqual(x_meta.name, x.name)
+        self.assertEqual(y_meta.name, y.name)
+
+    def test_meta_info_hash(self):
+        x = paddle.rand([2, 3])
+        y = paddle.rand([2, 3])
+        z = paddle.rand([3, 2])
+        self.assertEqual(MetaInfo.from_tensor(x), MetaInfo.from_tensor(y))
+        self.assertEqual(
+            hash(MetaInfo.from_tensor(x)), hash(MetaInfo.from_tensor(y))
+        )
+        self.assertNotEqual(MetaInfo.from_tensor(x), MetaInfo.from_tensor(z))
+
+
+if __name__ == "__main__":
+    unittest.main()